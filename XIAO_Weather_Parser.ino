@@ -799,9 +799,25 @@ void parseSeaviewData(String jsonData, unsigned long fetchTime) {
   
   unsigned long parseStart = millis();
   
+  // Only keep the fields read below, so the many unused condition fields never take
+  // up room in the JSON buffer. The filter must match the root type (array or object).
+  StaticJsonDocument<512> filter;
+  int arrayStart = jsonData.indexOf('[');
+  int objectStart = jsonData.indexOf('{');
+  JsonObject keep = (arrayStart >= 0 && (objectStart < 0 || arrayStart < objectStart))
+                      ? filter.createNestedObject()
+                      : filter.to<JsonObject>();
+  keep["currConditionValues"][0]["sensorDataName"] = true;
+  keep["currConditionValues"][0]["convertedValue"] = true;
+  keep["currConditionValues"][0]["unitLabel"] = true;
+  keep["highLowValues"][0]["sensorDataName"] = true;
+  keep["highLowValues"][0]["convertedValue"] = true;
+  keep["highLowValues"][0]["unitLabel"] = true;
+  keep["lastUpdate"] = true;
+  
   // Parse JSON using ArduinoJson library
   DynamicJsonDocument doc(JSON_BUFFER_SIZE);
-  DeserializationError error = deserializeJson(doc, jsonData);
+  DeserializationError error = deserializeJson(doc, jsonData, DeserializationOption::Filter(filter));
   
   if (error) {
     Serial.printf("[ERROR] JSON parsing failed: %s\n", error.c_str());
@@ -835,17 +851,23 @@ void parseSeaviewData(String jsonData, unsigned long fetchTime) {
   
   // Parse current conditions - prioritize 2-minute averages for more stable readings
   for (JsonObject condition : conditions) {
+    // Check the value first so invalid entries skip the name/unit lookups and copies
+    const char* rawValue = condition["convertedValue"] | "";
+    if (rawValue[0] == '\0' || strcmp(rawValue, "--") == 0 || strcmp(rawValue, "null") == 0) continue;
+    
+    String value = rawValue;
     String dataName = condition["sensorDataName"] | "";
-    String value = condition["convertedValue"] | "";
     String unit = condition["unitLabel"] | "";
     
-    // Skip invalid values
-    if (value == "--" || value == "" || value == "null") continue;
-    
     DEBUG_PRINTF("[DEBUG] Found: %s = %s %s\n", dataName.c_str(), value.c_str(), unit.c_str());
     
+    // Classify the name once instead of re-scanning it for every field below
+    bool isTwoMin = dataName.indexOf("2 Min") >= 0;
+    bool isWindSpeed = dataName.indexOf("Wind Speed") >= 0;
+    bool isWindDirection = !isWindSpeed && dataName.indexOf("Wind Direction") >= 0;
+    
     // Prioritize 2-minute average wind speed for more stable readings
-    if (dataName.indexOf("2 Min") >= 0 && dataName.indexOf("Wind Speed") >= 0) {
+    if (isTwoMin && isWindSpeed) {
       windSpeed = value.toFloat();
       if (unit == "knots") {
         data.windSpeed = windSpeed * 0.514444; // Convert knots to m/s
@@ -853,7 +875,7 @@ void parseSeaviewData(String jsonData, unsigned long fetchTime) {
         data.windSpeed = windSpeed; // Assume m/s
       }
       DEBUG_PRINTF("[DEBUG] Using 2-min avg wind speed: %.1f\n", windSpeed);
-    } else if (dataName == "Wind Speed" && data.windSpeed == 0.0) {
+    } else if (isWindSpeed && data.windSpeed == 0.0 && dataName == "Wind Speed") {
       // Fallback to current wind speed if no 2-min average found
       windSpeed = value.toFloat();
       if (unit == "knots") {
@@ -864,16 +886,16 @@ void parseSeaviewData(String jsonData, unsigned long fetchTime) {
     }
     
     // Prioritize 2-minute average wind direction
-    if (dataName.indexOf("2 Min") >= 0 && dataName.indexOf("Wind Direction") >= 0) {
+    if (isTwoMin && isWindDirection) {
       data.windDirection = value.toInt();
       DEBUG_PRINTF("[DEBUG] Using 2-min avg wind direction: %d\n", data.windDirection);
-    } else if (dataName == "Wind Direction" && data.windDirection == 0) {
+    } else if (isWindDirection && data.windDirection == 0 && dataName == "Wind Direction") {
       // Fallback to current wind direction if no 2-min average found
       data.windDirection = value.toInt();
     }
     
     // Look for wind gust data (10-minute high or other high values)
-    if (dataName.indexOf("High Wind Speed") >= 0 || dataName.indexOf("10 Min High") >= 0) {
+    if ((isWindSpeed && dataName.indexOf("High Wind Speed") >= 0) || dataName.indexOf("10 Min High") >= 0) {
       float gustValue = value.toFloat();
       if (gustValue > windGust) {
         windGust = gustValue;
@@ -886,8 +908,8 @@ void parseSeaviewData(String jsonData, unsigned long fetchTime) {
       }
     }
     
-    // Temperature data
-    if (dataName.indexOf("Temperature") >= 0 || dataName.indexOf("Temp") >= 0) {
+    // Temperature data ("Temp" also covers "Temperature")
+    if (!isWindSpeed && !isWindDirection && dataName.indexOf("Temp") >= 0) {
       data.temperature = value.toFloat();
     }
   }
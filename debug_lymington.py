@@ -2,11 +2,52 @@
 """
 Debug script to inspect Lymington WeatherFile API response structure
 """
+import re
+import sys
 import requests
-import json
+try:
+    import orjson as json  # Faster drop-in for the json.loads()/JSONDecodeError usage here
+except ImportError:
+    import json
 
-def debug_lymington_api():
-    """Debug the Lymington WeatherFile API to see all available parameters"""
+# Start of the "data" object, and the string/bracket tokens needed to walk it, matched
+# directly in the raw response bytes
+_DATA_OBJECT_RE = re.compile(rb'"data"\s*:\s*\{')
+_JSON_TOKEN_RE = re.compile(rb'"((?:[^"\\]|\\.)*)"(\s*:)?|[{}\[\]]')
+
+def scan_data_keys(raw):
+    """Return the keys of the "data" object without deserialising the JSON"""
+    start = _DATA_OBJECT_RE.search(raw)
+    if start is None:
+        return []
+    
+    keys = []
+    depth = 1
+    for token in _JSON_TOKEN_RE.finditer(raw, start.end()):
+        if token.group(1) is not None:
+            # A string followed by ':' directly inside the data object is one of its keys
+            if depth == 1 and token.group(2):
+                keys.append(token.group(1).decode())
+        else:
+            depth += 1 if token.group() in (b'{', b'[') else -1
+            if depth == 0:
+                break
+    return keys
+
+def find_gust_keys(keys):
+    """Return parameter names that look like gust/max/peak values"""
+    return [k for k in keys if any(term in k.lower() for term in ['max', 'gust', 'peak', 'high'])]
+
+def find_wind_keys(keys):
+    """Return parameter names that look wind-related"""
+    return [k for k in keys if 'w' in k.lower() and ('c' in k.lower() or 'd' in k.lower() or 'speed' in k.lower() or 'dir' in k.lower())]
+
+def debug_lymington_api(keys_only=False):
+    """Debug the Lymington WeatherFile API to see all available parameters
+    
+    Pass keys_only=True to just list the weather data parameter names, found by scanning
+    the raw response bytes instead of parsing the full JSON.
+    """
     print("🔍 Debugging Lymington WeatherFile API...")
     
     url = "https://weatherfile.com/V03/loc/GBR00001/latest.json"
@@ -17,14 +58,30 @@ def debug_lymington_api():
         'X-Requested-With': 'XMLHttpRequest',
         'Referer': 'https://weatherfile.com/location?loc_id=GBR00001&wt=KTS',
         'Origin': 'https://weatherfile.com',
-        'Content-Length': '0',
         'wf-tkn': 'PUBLIC'
     }
     
     try:
         response = requests.post(url, headers=headers, data='', timeout=10)
         if response.status_code == 200:
-            data = response.json()
+            if keys_only:
+                keys = sorted(scan_data_keys(response.content))
+                print(f"Weather data contains {len(keys)} parameters:")
+                print("-" * 50)
+                for key in keys:
+                    print(f"  {key}")
+                
+                print(f"\n🔍 Checking for gust/max/peak parameters:")
+                gust_related = find_gust_keys(keys)
+                if gust_related:
+                    print(f"  Found gust-related parameters: {gust_related}")
+                else:
+                    print(f"  ❌ No obvious gust/max/peak parameters found")
+                
+                print(f"\n💨 All wind-related parameters: {find_wind_keys(keys)}")
+                return True
+            
+            data = json.loads(response.content)
             
             print(f"Status: {data.get('status')}")
             print(f"Raw response keys: {list(data.keys())}")
@@ -43,7 +100,7 @@ def debug_lymington_api():
                 
                 # Look for potential gust/max parameters
                 print(f"\n🔍 Checking for gust/max/peak parameters:")
-                gust_related = [k for k in sorted_keys if any(term in k.lower() for term in ['max', 'gust', 'peak', 'high'])]
+                gust_related = find_gust_keys(sorted_keys)
                 if gust_related:
                     print(f"  Found gust-related parameters: {gust_related}")
                     for key in gust_related:
@@ -53,7 +110,7 @@ def debug_lymington_api():
                 
                 # Check wind-related parameters specifically
                 print(f"\n💨 All wind-related parameters:")
-                wind_related = [k for k in sorted_keys if 'w' in k.lower() and ('c' in k.lower() or 'd' in k.lower() or 'speed' in k.lower() or 'dir' in k.lower())]
+                wind_related = find_wind_keys(sorted_keys)
                 for key in wind_related:
                     print(f"    {key}: {weather_data[key]} - {type(weather_data[key]).__name__}")
                     
@@ -67,4 +124,4 @@ def debug_lymington_api():
         return False
 
 if __name__ == "__main__":
-    debug_lymington_api()
+    debug_lymington_api(keys_only='--keys-only' in sys.argv[1:])
@@ -3,144 +3,168 @@
 Advanced investigation of Navis API endpoints to find averaged/peak data
 """
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+try:
+    import orjson as json  # Faster drop-in for the json.loads()/JSONDecodeError usage here
+except ImportError:
+    import json
+import logging
+import os
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+from navis_historical_parser import API_HEADERS, BASE_HEADERS, QUERY_URL, SESSION_URL
+
+log = logging.getLogger(__name__)
+
+# Maximum number of in-flight probes - keeps the sweep polite to the Navis server
+MAX_CONCURRENT_PROBES = 4
+
+# Query parameters to probe; {now}, {hour_ago} and {day_ago} are filled in per sweep
+_ENDPOINT_TEMPLATES = (
+    # Basic live data (we know this works)
+    "type=live",
+    
+    # Historical data endpoints with different time ranges
+    "type=data",
+    "type=data&from={hour_ago}&to={now}",
+    "type=data&from={day_ago}&to={now}",
+    "type=log",
+    "type=log&from={hour_ago}&to={now}",
+    
+    # Try some variations
+    "type=stats",
+    "type=summary",
+    "type=average",
+    "type=peak",
+    "type=chart",
+    
+    # Different time formats
+    "type=data&from=0&to={now}",
+    "type=data&range=hour",
+    "type=data&range=day",
+)
+
+def probe_endpoint(session, endpoint, headers):
+    """Fetch a single endpoint, returning the response or the exception raised"""
+    try:
+        return session.get(endpoint, headers=headers, timeout=10)
+    except Exception as e:
+        return e
+
 def investigate_navis_endpoints():
-    """Investigate different Navis API endpoints and parameters"""
+    """Investigate different Navis API endpoints and parameters
+    
+    Generator yielding (endpoint, content) for each endpoint that returns data, as soon
+    as it has been classified. Closing the generator early cancels any pending probes.
+    """
     print("🔍 Advanced Navis API Investigation...")
     
     # Establish session
     session = requests.Session()
-    session_url = "https://www.navis-livedata.com/view.php?u=36371"
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-        'Accept-Language': 'en-GB,en;q=0.9,fr;q=0.8',
-        'Connection': 'keep-alive'
-    }
+    session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=MAX_CONCURRENT_PROBES,
+                                          max_retries=Retry(total=3, backoff_factor=0.3)))
     
     print(f"  🔄 Establishing session...")
-    session_response = session.get(session_url, headers=headers, timeout=10)
+    session_response = session.get(SESSION_URL, headers=BASE_HEADERS, timeout=10)
     if session_response.status_code != 200:
         print(f"  ❌ Failed to establish session: {session_response.status_code}")
-        return False
+        return
     
     print(f"  ✅ Session established")
     
-    # Test different endpoint variations
-    imei = "083af23b9b89_15_1"
-    base_url = "https://www.navis-livedata.com/query.php"
-    
     # Current time and recent past for 'from'/'to' parameters
     now = int(time.time())
-    hour_ago = now - 3600
-    day_ago = now - 86400
+    times = {'now': now, 'hour_ago': now - 3600, 'day_ago': now - 86400}
     
-    endpoints_to_try = [
-        # Basic live data (we know this works)
-        f"{base_url}?imei={imei}&type=live",
-        
-        # Historical data endpoints with different time ranges
-        f"{base_url}?imei={imei}&type=data",
-        f"{base_url}?imei={imei}&type=data&from={hour_ago}&to={now}",
-        f"{base_url}?imei={imei}&type=data&from={day_ago}&to={now}",
-        f"{base_url}?imei={imei}&type=log",
-        f"{base_url}?imei={imei}&type=log&from={hour_ago}&to={now}",
-        
-        # Try some variations
-        f"{base_url}?imei={imei}&type=stats",
-        f"{base_url}?imei={imei}&type=summary",
-        f"{base_url}?imei={imei}&type=average",
-        f"{base_url}?imei={imei}&type=peak",
-        f"{base_url}?imei={imei}&type=chart",
-        
-        # Different time formats
-        f"{base_url}?imei={imei}&type=data&from=0&to={now}",
-        f"{base_url}?imei={imei}&type=data&range=hour",
-        f"{base_url}?imei={imei}&type=data&range=day",
-    ]
-    
-    api_headers = headers.copy()
-    api_headers.update({
-        'Accept': '*/*',
-        'Referer': session_url,
-        'Sec-Fetch-Dest': 'empty',
-        'Sec-Fetch-Mode': 'cors',
-        'Sec-Fetch-Site': 'same-origin'
-    })
-    
-    successful_endpoints = []
+    # Test different endpoint variations
+    endpoints_to_try = [f"{QUERY_URL}&{template.format(**times)}" for template in _ENDPOINT_TEMPLATES]
     
-    for i, endpoint in enumerate(endpoints_to_try, 1):
-        print(f"\n📊 Testing endpoint {i}/{len(endpoints_to_try)}: {endpoint}")
+    # Probe endpoints concurrently over the pooled session; results are reported in sweep order
+    executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_PROBES)
+    try:
+        responses = executor.map(lambda endpoint: probe_endpoint(session, endpoint, API_HEADERS),
+                                 endpoints_to_try)
         
-        try:
-            response = session.get(endpoint, headers=api_headers, timeout=10)
-            print(f"    Status: {response.status_code}")
+        for i, (endpoint, response) in enumerate(zip(endpoints_to_try, responses), 1):
+            log.info("\n📊 Testing endpoint %d/%d: %s", i, len(endpoints_to_try), endpoint)
+            
+            if isinstance(response, Exception):
+                log.warning("    ❌ Exception: %s (%s)", response, endpoint)
+                continue
             
-            if response.status_code == 200:
-                content = response.text.strip()
-                print(f"    Length: {len(content)} bytes")
+            try:
+                log.info("    Status: %d", response.status_code)
                 
-                if content:
-                    # Check if it looks like the live data format
-                    if ':' in content and len(content.split(':')) == 3:
-                        print(f"    Format: Colon-delimited (live data)")
-                        print(f"    Content: {content}")
+                if response.status_code == 200:
+                    content = response.text.strip()
+                    log.info("    Length: %d bytes", len(content))
                     
-                    # Check if it's JSON
-                    elif content.startswith('{') or content.startswith('['):
-                        print(f"    Format: JSON")
-                        try:
-                            data = json.loads(content)
-                            print(f"    JSON keys: {list(data.keys()) if isinstance(data, dict) else f'Array with {len(data)} items'}")
-                            if isinstance(data, list) and len(data) > 0:
-                                print(f"    First item keys: {list(data[0].keys()) if isinstance(data[0], dict) else 'Not dict'}")
-                        except json.JSONDecodeError:
-                            print(f"    Invalid JSON")
-                    
-                    # Check for multi-line data (could be CSV or structured)
-                    elif '\n' in content:
-                        lines = content.split('\n')
-                        print(f"    Format: Multi-line ({len(lines)} lines)")
-                        print(f"    First few lines:")
-                        for line in lines[:3]:
-                            if line.strip():
-                                print(f"      {line[:80]}...")
-                    
-                    # Single line, non-JSON
+                    if content:
+                        # Check if it looks like the live data format
+                        if content.count(':') == 2:
+                            log.info("    Format: Colon-delimited (live data)")
+                            log.info("    Content: %s", content)
+                        
+                        # Check if it's JSON
+                        elif content[:1] in ('{', '['):
+                            log.info("    Format: JSON")
+                            try:
+                                data = json.loads(response.content)  # parse the raw bytes, not the decoded text
+                                log.info("    JSON keys: %s", list(data.keys()) if isinstance(data, dict) else f'Array with {len(data)} items')
+                                if isinstance(data, list) and len(data) > 0:
+                                    log.info("    First item keys: %s", list(data[0].keys()) if isinstance(data[0], dict) else 'Not dict')
+                            except json.JSONDecodeError:
+                                log.info("    Invalid JSON")
+                        
+                        # Check for multi-line data (could be CSV or structured)
+                        elif '\n' in content:
+                            lines = content.split('\n')
+                            log.info("    Format: Multi-line (%d lines)", len(lines))
+                            log.info("    First few lines:")
+                            for line in lines[:3]:
+                                if line.strip():
+                                    log.info("      %s...", line[:80])
+                        
+                        # Single line, non-JSON
+                        else:
+                            log.info("    Format: Single line text")
+                            log.info("    Content preview: %s...", content[:100])
+                        
+                        yield endpoint, content
                     else:
-                        print(f"    Format: Single line text")
-                        print(f"    Content preview: {content[:100]}...")
-                    
-                    successful_endpoints.append((endpoint, content))
+                        log.warning("    ❌ Empty response (%s)", endpoint)
                 else:
-                    print(f"    ❌ Empty response")
-            else:
-                print(f"    ❌ HTTP Error: {response.status_code}")
-                
-        except Exception as e:
-            print(f"    ❌ Exception: {e}")
-        
-        time.sleep(0.5)  # Be polite to the server
-    
-    print(f"\n📋 Summary: Found {len(successful_endpoints)} working endpoints")
-    
-    return successful_endpoints
+                    log.warning("    ❌ HTTP Error: %s (%s)", response.status_code, endpoint)
+                    
+            except Exception as e:
+                log.warning("    ❌ Exception: %s (%s)", e, endpoint)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
 if __name__ == "__main__":
-    results = investigate_navis_endpoints()
+    # Failed endpoints are logged at WARNING, per-endpoint format details at INFO;
+    # set LOGLEVEL=INFO to see those too
+    logging.basicConfig(level=os.environ.get('LOGLEVEL', 'WARNING').upper(), format='%(message)s')
+    # --first stops the sweep (and cancels pending probes) at the first endpoint with data
+    stop_at_first = '--first' in sys.argv[1:]
+    
+    results = []
+    for endpoint, content in investigate_navis_endpoints():
+        results.append(endpoint)
+        print(f"\n✅ {endpoint}")
+        if len(content) < 200:
+            print(f"   Content: {content}")
+        else:
+            print(f"   Content preview: {content[:200]}...")
+        
+        if stop_at_first:
+            break
     
     if results:
         print(f"\n🎉 Found {len(results)} endpoints with data!")
-        for endpoint, content in results:
-            print(f"\n✅ {endpoint}")
-            if len(content) < 200:
-                print(f"   Content: {content}")
-            else:
-                print(f"   Content preview: {content[:200]}...")
     else:
         print(f"\n😞 No additional endpoints found")
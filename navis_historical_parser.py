@@ -3,9 +3,50 @@
 Parse Navis historical data to calculate averages and peaks
 """
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 from datetime import datetime
-import statistics
+import logging
+import math
+import os
+import re
+import struct
+from array import array
+from types import MappingProxyType
+
+log = logging.getLogger(__name__)
+
+SESSION_URL = "https://www.navis-livedata.com/view.php?u=36371"
+QUERY_URL = "https://www.navis-livedata.com/query.php?imei=083af23b9b89_15_1"
+
+# Browser-like headers for the view.php page, shared with the other Navis scripts and
+# frozen so none of them can mutate another's copy
+BASE_HEADERS = MappingProxyType({
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
+    'Accept-Language': 'en-GB,en;q=0.9,fr;q=0.8',
+    'Connection': 'keep-alive'
+})
+
+# Full header set for XHR-style query.php requests, usable on any session
+API_HEADERS = MappingProxyType({
+    **BASE_HEADERS,
+    'Accept': '*/*',
+    'Referer': SESSION_URL,
+    'Sec-Fetch-Dest': 'empty',
+    'Sec-Fetch-Mode': 'cors',
+    'Sec-Fetch-Site': 'same-origin'
+})
+
+# Big-endian MSB/LSB pair of a 64-bit Navis sensor word
+_WORD = struct.Struct('>II')
+
+# One whole historical reading: optional "timestamp," prefix, then "interval:hexdata"
+_READING_RE = re.compile(r'\s*(?:[^,]*,)?[^:]*:([0-9A-Fa-f]+)\s*')
+
+# A well-formed reading payload: at least one 32-bit LSB worth of hex digits
+_HEX_PAYLOAD_RE = re.compile(r'[0-9A-Fa-f]{8,}')
 
 def decode_navis_hex(hex_data):
     """Decode Navis hex data using the same algorithm as before"""
@@ -13,139 +54,156 @@ def decode_navis_hex(hex_data):
         return None
         
     try:
-        # Split hex into MSB and LSB
-        MSB = 0
-        if len(hex_data) > 8:
-            MSB = int(hex_data[:-8], 16)  # All but last 8 chars
-        LSB = int(hex_data[-8:], 16)      # Last 8 chars
-        
-        # Extract values using JavaScript bit manipulation
-        temp_raw = MSB & 0x7FF                  # bits 0-10 of MSB
-        speed_raw = LSB >> 16                   # bits 16-31 of LSB  
-        direction_raw = (LSB >> 7) & 0x1FF     # bits 7-15 of LSB (9 bits)
-        rssi_raw = LSB & 0x7F                   # bits 0-6 of LSB
-        
-        # Apply JavaScript recalc() conversions
-        speed_ms = speed_raw / 10.0             # Divide by 10 first
-        speed_knots = speed_ms * 1.94384449     # Convert m/s to knots
-        temp_celsius = (temp_raw - 400) / 10.0  # Temperature formula
-        
-        return {
-            'speed_knots': speed_knots,
-            'speed_ms': speed_ms,
-            'direction': direction_raw,
-            'temperature': temp_celsius,
-            'rssi': rssi_raw
-        }
-    except Exception as e:
+        # Split hex into MSB and LSB with one hex decode plus two 32-bit loads.
+        # Only the low 32 bits of the MSB are used, so longer payloads keep their last 16 digits.
+        MSB, LSB = _WORD.unpack(bytes.fromhex(hex_data[-16:].zfill(16)))
+    except (ValueError, struct.error):
         return None
-
-def fetch_navis_historical_data(minutes_back=60):
-    """Fetch historical data from Navis API"""
-    print(f"🔍 Fetching Navis historical data (last {minutes_back} minutes)...")
-    
-    # Establish session
-    session = requests.Session()
-    session_url = "https://www.navis-livedata.com/view.php?u=36371"
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-        'Accept-Language': 'en-GB,en;q=0.9,fr;q=0.8',
-        'Connection': 'keep-alive'
+    # Extract values using JavaScript bit manipulation
+    temp_raw = MSB & 0x7FF                  # bits 0-10 of MSB
+    speed_raw = LSB >> 16                   # bits 16-31 of LSB  
+    direction_raw = (LSB >> 7) & 0x1FF     # bits 7-15 of LSB (9 bits)
+    rssi_raw = LSB & 0x7F                   # bits 0-6 of LSB
+    
+    # Apply JavaScript recalc() conversions
+    speed_ms = speed_raw / 10.0             # Divide by 10 first
+    speed_knots = speed_ms * 1.94384449     # Convert m/s to knots
+    temp_celsius = (temp_raw - 400) / 10.0  # Temperature formula
+    
+    return {
+        'speed_knots': speed_knots,
+        'speed_ms': speed_ms,
+        'direction': direction_raw,
+        'temperature': temp_celsius,
+        'rssi': rssi_raw
     }
+
+def decode_navis_batch(hex_values):
+    """Decode a batch of Navis hex readings into parallel per-field typed arrays
+    
+    All readings are hex-decoded together into 64-bit words and unpacked with the same
+    bit layout as decode_navis_hex. Fields are stored as compact arrays (float32 for
+    measurements, which only need ~3 significant figures) instead of a dict per reading.
+    """
+    # Pad every payload to one 64-bit word and hex-decode the whole batch in a single call.
+    # Only the low 32 bits of the MSB are used, so oversize payloads keep their last 16 digits.
+    padded = [hex_data[-16:].zfill(16) for hex_data in hex_values if _HEX_PAYLOAD_RE.fullmatch(hex_data)]
+    words = list(_WORD.iter_unpack(bytes.fromhex(''.join(padded))))  # (MSB, LSB) pairs
+    
+    speeds_ms = array('f', [(lsb >> 16) / 10.0 for _, lsb in words])
+    
+    return {
+        'speed_knots': array('f', [speed_ms * 1.94384449 for speed_ms in speeds_ms]),
+        'speed_ms': speeds_ms,
+        'direction': array('H', [(lsb >> 7) & 0x1FF for _, lsb in words]),
+        'temperature': array('f', [((msb & 0x7FF) - 400) / 10.0 for msb, _ in words]),
+        'rssi': array('B', [lsb & 0x7F for _, lsb in words])
+    }
+
+def create_navis_session():
+    """Open a pooled session and obtain the Navis session cookie from the viewer page"""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=4,
+                                          max_retries=Retry(total=3, backoff_factor=0.3)))
+    session.headers.update(BASE_HEADERS)
     
-    session_response = session.get(session_url, headers=headers, timeout=10)
+    session_response = session.get(SESSION_URL, timeout=10)
     if session_response.status_code != 200:
         print(f"  ❌ Failed to establish session: {session_response.status_code}")
         return None
     
+    return session
+
+def fetch_navis_historical_data(session, minutes_back=60):
+    """Fetch historical data from Navis API using an established session"""
+    print(f"🔍 Fetching Navis historical data (last {minutes_back} minutes)...")
+    
     # Calculate time range
     now = int(time.time())
     from_time = now - (minutes_back * 60)
     
     # Get historical data
-    api_url = f"https://www.navis-livedata.com/query.php?imei=083af23b9b89_15_1&type=data&from={from_time}&to={now}"
-    
-    api_headers = headers.copy()
-    api_headers.update({
-        'Accept': '*/*',
-        'Referer': session_url,
-        'Sec-Fetch-Dest': 'empty',
-        'Sec-Fetch-Mode': 'cors',
-        'Sec-Fetch-Site': 'same-origin'
-    })
+    api_url = f"{QUERY_URL}&type=data&from={from_time}&to={now}"
     
     print(f"  📊 Requesting data from {datetime.fromtimestamp(from_time)} to {datetime.fromtimestamp(now)}")
     
-    response = session.get(api_url, headers=api_headers, timeout=15)
-    if response.status_code != 200:
-        print(f"  ❌ API Error: {response.status_code}")
-        return None
-    
-    content = response.text.strip()
-    if not content or content == "error":
+    # The with-block returns the streamed connection to the pool on every path
+    with session.get(api_url, headers=API_HEADERS, timeout=15, stream=True) as response:
+        if response.status_code != 200:
+            print(f"  ❌ API Error: {response.status_code}")
+            return None
+        
+        if response.encoding is None:
+            response.encoding = 'utf-8'
+        
+        # Split readings off the pipe-delimited body as chunks arrive, so the whole
+        # response is never held as one string (the readings list itself is still built)
+        readings = []
+        received = 0
+        tail = ""
+        for chunk in response.iter_content(chunk_size=64 * 1024, decode_unicode=True):
+            received += len(chunk)
+            parts = (tail + chunk).split('|')
+            tail = parts.pop()
+            readings.extend(parts)
+    
+    tail = tail.strip()
+    if tail:
+        readings.append(tail)
+    
+    if not readings or readings == ["error"]:
         print(f"  ❌ No data or error response")
         return None
     
-    print(f"  ✅ Received {len(content)} bytes of historical data")
+    print(f"  ✅ Received {received} bytes of historical data")
     
-    return content
+    return readings
 
-def parse_navis_historical_data(raw_data):
-    """Parse the pipe-delimited historical data format"""
-    print(f"  🔄 Parsing historical data...")
+def parse_navis_historical_data(readings):
+    """Parse pipe-separated historical readings into per-field arrays"""
+    log.debug("  🔄 Parsing historical data...")
     
     # Format appears to be: timestamp,interval:hexdata|interval:hexdata|...
-    data_points = []
-    
-    # Split by pipe to get individual readings
-    readings = raw_data.split('|')
-    print(f"  📊 Found {len(readings)} data points")
+    hex_values = []
+    count = 0
     
-    for reading in readings:
-        if not reading.strip():
-            continue
-            
+    # readings may be any iterable, so count while walking it rather than up front
+    for count, reading in enumerate(readings, 1):
         # Each reading format: "interval:hexdata" or "timestamp,interval:hexdata"
-        if ':' in reading:
-            if ',' in reading:
-                # Format: timestamp,interval:hexdata
-                timestamp_part, hex_part = reading.split(',', 1)
-                interval, hex_data = hex_part.split(':', 1)
-            else:
-                # Format: interval:hexdata
-                interval, hex_data = reading.split(':', 1)
-            
-            # Decode the hex data
-            decoded = decode_navis_hex(hex_data)
-            if decoded:
-                data_points.append(decoded)
-    
-    print(f"  ✅ Successfully parsed {len(data_points)} valid data points")
+        match = _READING_RE.fullmatch(reading)
+        if match:
+            hex_values.append(match.group(1))
+    
+    log.debug("  📊 Found %d data points", count)
+    
+    # Decode all readings in one batch
+    data_points = decode_navis_batch(hex_values)
+    
+    log.debug("  ✅ Successfully parsed %d valid data points", len(data_points['speed_ms']))
     return data_points
 
 def calculate_statistics(data_points):
     """Calculate average and peak values from data points"""
-    if not data_points:
+    if not data_points or not data_points['speed_ms']:
         return None
     
-    print(f"  🧮 Calculating statistics from {len(data_points)} data points...")
+    log.debug("  🧮 Calculating statistics from %d data points...", len(data_points['speed_ms']))
     
     # Extract just the speed values for statistics
-    speeds_knots = [dp['speed_knots'] for dp in data_points if dp['speed_knots'] >= 0]
-    speeds_ms = [dp['speed_ms'] for dp in data_points if dp['speed_ms'] >= 0]
-    directions = [dp['direction'] for dp in data_points if 0 <= dp['direction'] <= 360]
-    temps = [dp['temperature'] for dp in data_points if -20 <= dp['temperature'] <= 50]
+    speeds_knots = [speed for speed in data_points['speed_knots'] if speed >= 0]
+    speeds_ms = [speed for speed in data_points['speed_ms'] if speed >= 0]
+    directions = [direction for direction in data_points['direction'] if 0 <= direction <= 360]
+    temps = [temp for temp in data_points['temperature'] if -20 <= temp <= 50]
     
     if not speeds_knots:
-        print(f"  ❌ No valid speed data found")
+        log.warning("  ❌ No valid speed data found")
         return None
     
     # Calculate statistics
     stats = {
-        'avg_speed_knots': statistics.mean(speeds_knots),
-        'avg_speed_ms': statistics.mean(speeds_ms),
+        'avg_speed_knots': math.fsum(speeds_knots) / len(speeds_knots),
+        'avg_speed_ms': math.fsum(speeds_ms) / len(speeds_ms),
         'peak_speed_knots': max(speeds_knots),
         'peak_speed_ms': max(speeds_ms),
         'min_speed_knots': min(speeds_knots),
@@ -155,10 +213,10 @@ def calculate_statistics(data_points):
     
     if directions:
         # Circular mean for wind direction is complex, use simple mean for now
-        stats['avg_direction'] = statistics.mean(directions)
+        stats['avg_direction'] = math.fsum(directions) / len(directions)
     
     if temps:
-        stats['avg_temperature'] = statistics.mean(temps)
+        stats['avg_temperature'] = math.fsum(temps) / len(temps)
     
     return stats
 
@@ -167,17 +225,23 @@ def main():
     print("🌊 Navis Historical Data Analysis")
     print("=" * 50)
     
+    # One session (and Navis cookie) serves both the historical and live requests
+    session = create_navis_session()
+    if session is None:
+        print("❌ Failed to establish Navis session")
+        return
+    
     # Fetch recent historical data
-    raw_data = fetch_navis_historical_data(minutes_back=60)  # Last hour
+    readings = fetch_navis_historical_data(session, minutes_back=60)  # Last hour
     
-    if not raw_data:
+    if not readings:
         print("❌ Failed to fetch historical data")
         return
     
     # Parse the data
-    data_points = parse_navis_historical_data(raw_data)
+    data_points = parse_navis_historical_data(readings)
     
-    if not data_points:
+    if not data_points['speed_ms']:
         print("❌ Failed to parse historical data")
         return
     
@@ -205,17 +269,7 @@ def main():
     print(f"\\n🔍 Now compare with live instantaneous reading...")
     
     # Also get current live data for comparison
-    session = requests.Session()
-    session_url = "https://www.navis-livedata.com/view.php?u=36371"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-    }
-    
-    session.get(session_url, headers=headers)
-    
-    live_response = session.get("https://www.navis-livedata.com/query.php?imei=083af23b9b89_15_1&type=live", 
-                               headers={'Accept': '*/*', 'Referer': session_url})
+    live_response = session.get(f"{QUERY_URL}&type=live", headers=API_HEADERS, timeout=10)
     
     if live_response.status_code == 200:
         live_content = live_response.text.strip()
@@ -231,4 +285,6 @@ def main():
                         print(f"Temperature: {live_decoded['temperature']:.1f}°C")
 
 if __name__ == "__main__":
+    # Parsing diagnostics are logged at DEBUG; set LOGLEVEL=DEBUG to see them
+    logging.basicConfig(level=os.environ.get('LOGLEVEL', 'WARNING').upper(), format='%(message)s')
     main()
@@ -6,19 +6,116 @@ Validates enhanced parsing features including 2-min averages and GMT timestamps.
 """
 
 import requests
-import json
+try:
+    import orjson as json  # Faster drop-in for the json.loads()/JSONDecodeError usage here
+except ImportError:
+    import json
+import os
+import re
+import sys
+import threading
 import time
-from datetime import datetime
+from datetime import datetime, timezone
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from itertools import islice
+from types import MappingProxyType
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from navis_historical_parser import (API_HEADERS as _NAVIS_API_HEADERS, BASE_HEADERS as _NAVIS_BASE_HEADERS,
+                                     QUERY_URL as NAVIS_QUERY_URL, SESSION_URL as NAVIS_SESSION_URL,
+                                     decode_navis_hex, parse_navis_historical_data)
 
 # Constants for data validation
 KNOTS_TO_MS = 0.514444
 
+# Precompiled patterns for HTML/text parsing
+_NUMERIC_RE = re.compile(r'([0-9]+\.?[0-9]*)')
+_NUM_TOKENS_RE = re.compile(r'\d+\.?\d*')
+
+# Table labels read from the Brambles HTML snapshot, matched together in a single scan.
+# Repeats are bounded (and never overlap their neighbours) so a malformed or hostile
+# page can't trigger heavy backtracking.
+BRAMBLE_LABELS = ("Wind Speed", "Max Gust", "Wind Direction", "Air Temp", "Pressure", "Updated")
+_BRAMBLE_LABEL_KEYS = frozenset(label.lower() for label in BRAMBLE_LABELS)
+_BRAMBLE_ROW_RE = re.compile(r'<td>\s{0,32}(' + '|'.join(map(re.escape, BRAMBLE_LABELS)) +
+                             r')\s{0,32}</td>\s{0,64}<td>([^<]{1,128})</td>', re.IGNORECASE)
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml.html as LH
+    from lxml.etree import ParserError
+except ImportError:
+    LH = None
+
+try:
+    from requests_cache import DO_NOT_CACHE, CachedSession
+except ImportError:
+    CachedSession = None
+
+# How often each station publishes new readings, in seconds. Polling faster than this
+# only fetches the same data again. Navis live data changes on every request.
+STATION_UPDATE_INTERVALS = {
+    'www.southamptonvts.co.uk': 600,
+    'weatherfile.com': 60,
+    'www.navis-livedata.com': 0,
+}
+
+# Shared HTTP session - keeps pooled keep-alive connections across all station tests.
+# With requests-cache installed, repeat runs within a station's update interval are
+# served from a local SQLite cache (the tests say so when they are), including the
+# WeatherFile POST, and older entries are revalidated with conditional GETs. Navis
+# live data is never cached since its session cookie and readings change on every
+# request.
+if CachedSession is not None:
+    SESSION = CachedSession('weather_cache', backend='sqlite', expire_after=60, cache_control=True,
+                            allowable_methods=('GET', 'POST'),
+                            urls_expire_after={**STATION_UPDATE_INTERVALS,
+                                               'www.navis-livedata.com': DO_NOT_CACHE})
+    SESSION.cache.delete(expired=True)
+else:
+    SESSION = requests.Session()
+# Retries back off with random jitter so several pollers that failed together don't
+# retry in lockstep; busy/unavailable responses are retried too. Retry-After is ignored:
+# urllib3 sleeps for whatever the server asks, uncapped, which would stall a 10 s check.
+# backoff_jitter needs urllib3 2.x - older versions just back off without it.
+_RETRY_OPTIONS = dict(total=3, backoff_factor=0.3, status_forcelist=(429, 502, 503, 504),
+                      respect_retry_after_header=False, raise_on_status=False)
+try:
+    _RETRY = Retry(backoff_jitter=0.3, **_RETRY_OPTIONS)
+except TypeError:
+    _RETRY = Retry(**_RETRY_OPTIONS)
+_ADAPTER = HTTPAdapter(pool_connections=8, pool_maxsize=3, max_retries=_RETRY)
+SESSION.mount("https://", _ADAPTER)
+SESSION.mount("http://", _ADAPTER)
+SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (compatible; WeatherStation/1.0)',
+    'Accept': '*/*'
+})
+
+# Per-station request headers, built once and frozen so no request can mutate them
+# (the Navis ones are shared from navis_historical_parser)
+_BRAMBLE_HEADERS = MappingProxyType({
+    'Accept': 'text/html,*/*',
+    'Referer': 'https://www.southamptonvts.co.uk/Live_Information/Tides_and_Weather/'
+})
+_LYMINGTON_HEADERS = MappingProxyType({
+    'X-Requested-With': 'XMLHttpRequest',
+    'Referer': 'https://weatherfile.com/location?loc_id=GBR00001&wt=KTS',
+    'Origin': 'https://weatherfile.com',
+    'wf-tkn': 'PUBLIC'
+})
+
 def validate_wind_data(speed_knots, direction, name="Wind"):
     """Validate wind speed and direction data"""
-    speed_ms = speed_knots * KNOTS_TO_MS if speed_knots else 0
-    
     if speed_knots and 0 <= speed_knots <= 200:  # Reasonable wind speed range
-        print(f"  ✅ {name}: {speed_knots:.1f} knots ({speed_ms:.1f} m/s)")
+        print(f"  ✅ {name}: {speed_knots:.1f} knots ({speed_knots * KNOTS_TO_MS:.1f} m/s)")
         valid = True
     else:
         print(f"  ❌ {name}: Invalid or missing ({speed_knots})")
@@ -33,65 +130,132 @@ def validate_wind_data(speed_knots, direction, name="Wind"):
         
     return valid
 
-def extract_table_cell_value(html_content, label):
-    """Extract value from HTML table cell format: <td>Label</td><td>Value Units</td>"""
-    import re
+@lru_cache(maxsize=8)
+def parse_bramble_table(html_content):
+    """Extract the BRAMBLE_LABELS <td>Label</td><td>Value</td> pairs as {label (lowercase): value}
+    
+    With selectolax (or else lxml) installed the document is parsed once and its cells
+    read from the DOM; otherwise, or if the DOM yields none of the labels, one regex pass
+    picks them up. The first occurrence of a label wins. Results are cached per document
+    (str hashes are computed once), so treat the returned dict as read-only.
+    """
+    cells = {}
+    
+    # Text of every <td> in document order, preferring embedded div text (like timestamps)
+    texts = []
+    if LexborHTMLParser is not None:
+        for td in LexborHTMLParser(html_content).css('td'):
+            div = td.css_first('div')
+            texts.append((div if div is not None else td).text(separator=' ', strip=True))
+    elif LH is not None:
+        # lxml refuses str input with an XML declaration (ValueError) and bodies with no
+        # elements (ParserError); leave those to the regex pass
+        try:
+            root = LH.fromstring(html_content)
+        except (ValueError, ParserError):
+            root = None
+        if root is not None:
+            for td in root.iter('td'):
+                div = td.find('.//div')
+                texts.append((div if div is not None else td).text_content().strip())
+    
+    # Pair each label cell with the cell after it, so bare <td> pairs outside a <tr> and
+    # several pairs per row are all found
+    for label, value in zip(texts, texts[1:]):
+        label = label.lower()
+        if label in _BRAMBLE_LABEL_KEYS and value:
+            cells.setdefault(label, value)
+    if cells:
+        return cells
+    
+    # Regex pass when no DOM parser is installed or the DOM pass found none of the labels
+    for match in _BRAMBLE_ROW_RE.finditer(html_content):
+        cells.setdefault(match.group(1).lower(), match.group(2).strip())
+        if len(cells) == len(BRAMBLE_LABELS):
+            break  # every wanted row found, skip the rest of the document
+    return cells
+
+def read_until_row_end(response, label, limit=32768):
+    """Read a streamed HTML response only until the table row holding label is complete
     
-    # Pattern to find the label cell followed by value cell
-    pattern = rf'<td>\s*{re.escape(label)}\s*</td>\s*<td>([^<]+)</td>'
-    match = re.search(pattern, html_content, re.IGNORECASE)
+    Stops once the <td>label cell's row has its closing </tr> (or after limit characters)
+    and closes the response, so the rest of the page is never downloaded or decoded.
+    With requests-cache installed, CachedSession reads the full body to store it before
+    returning, so the early stop only saves decoding there, not the download.
+    """
+    if response.encoding is None:
+        response.encoding = 'utf-8'
     
-    if match:
-        value_cell = match.group(1).strip()
-        # Check for embedded div tags (like timestamps)
-        div_match = re.search(r'<div[^>]*>([^<]+)</div>', value_cell)
-        if div_match:
-            return div_match.group(1).strip()
-        return value_cell
+    # Match the label as a cell (like _BRAMBLE_ROW_RE), not wherever the word appears
+    label_cell = re.compile(r'<td>\s{0,32}' + re.escape(label), re.IGNORECASE)
+    content = ''
+    label_at = -1
+    for chunk in response.iter_content(chunk_size=4096, decode_unicode=True):
+        if label_at == -1:
+            # Rescan a little of the previous text in case the cell straddles two chunks
+            rescan_from = max(0, len(content) - len(label) - 40)
+            content += chunk
+            match = label_cell.search(content, rescan_from)
+            label_at = match.start() if match else -1
+        else:
+            content += chunk
+        if (label_at != -1 and content.find('</tr>', label_at) != -1) or len(content) > limit:
+            break
     
+    response.close()
+    return content
+
+# Last response validators and parsed result per URL, reused by repeat polls
+CachedResult = namedtuple('CachedResult', 'etag last_modified parsed checked_at')
+_CONDITIONAL_CACHE = {}  # url -> CachedResult
+
+def fresh_result(url, max_age):
+    """Return the parsed result for url if it was checked less than max_age seconds ago"""
+    cached = _CONDITIONAL_CACHE.get(url)
+    if cached is not None and time.monotonic() - cached.checked_at < max_age:
+        return cached.parsed
     return None
 
+def conditional_headers(url, headers):
+    """Add If-None-Match/If-Modified-Since from the last response for url, if any"""
+    cached = _CONDITIONAL_CACHE.get(url)
+    if cached is None:
+        return headers
+    
+    validators = {}
+    if cached.etag:
+        validators['If-None-Match'] = cached.etag
+    if cached.last_modified:
+        validators['If-Modified-Since'] = cached.last_modified
+    return {**headers, **validators} if validators else headers
+
+def remember_result(url, response, parsed):
+    """Record response's ETag/Last-Modified and parsed result so the next poll can be conditional"""
+    _CONDITIONAL_CACHE[url] = CachedResult(response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                                           parsed, time.monotonic())
+
+def format_gmt(dt):
+    """Format a datetime in the Brambles style: DD/MM/YYYY HH:MM:SS GMT"""
+    return f"{dt.day:02d}/{dt.month:02d}/{dt.year} {dt.hour:02d}:{dt.minute:02d}:{dt.second:02d} GMT"
+
 def extract_numeric_from_value(value_str):
     """Extract numeric value from string like '15.7 Knots'"""
     if not value_str:
         return None
     
-    import re
-    match = re.search(r'([0-9]+\.?[0-9]*)', value_str)
+    match = _NUMERIC_RE.search(value_str)
     return float(match.group(1)) if match else None
 
-def decode_navis_hex(hex_data):
-    """Decode Navis hex data using the established algorithm"""
-    if len(hex_data) < 8:
-        return None
-        
-    try:
-        # Split hex into MSB and LSB
-        MSB = 0
-        if len(hex_data) > 8:
-            MSB = int(hex_data[:-8], 16)  # All but last 8 chars
-        LSB = int(hex_data[-8:], 16)      # Last 8 chars
-        
-        # Extract values using JavaScript bit manipulation
-        temp_raw = MSB & 0x7FF                  # bits 0-10 of MSB
-        speed_raw = LSB >> 16                   # bits 16-31 of LSB  
-        direction_raw = (LSB >> 7) & 0x1FF     # bits 7-15 of LSB (9 bits)
-        rssi_raw = LSB & 0x7F                   # bits 0-6 of LSB
-        
-        # Apply JavaScript recalc() conversions
-        speed_ms = speed_raw / 10.0             # Divide by 10 first
-        speed_knots = speed_ms * 1.94384449     # Convert m/s to knots
-        temp_celsius = (temp_raw - 400) / 10.0  # Temperature formula
-        
-        return {
-            'speed_knots': speed_knots,
-            'speed_ms': speed_ms,
-            'direction': direction_raw,
-            'temperature': temp_celsius,
-            'rssi': rssi_raw
-        }
-    except Exception as e:
-        return None
+def _iter_records(content, sep='|'):
+    """Yield sep-delimited records one at a time without building a list"""
+    start = 0
+    while True:
+        end = content.find(sep, start)
+        if end == -1:
+            yield content[start:]
+            return
+        yield content[start:end]
+        start = end + 1
 
 def get_navis_historical_stats(session, session_url, minutes_back=1):
     """Get averaged and peak wind speeds from Navis historical data
@@ -105,15 +269,11 @@ def get_navis_historical_stats(session, session_url, minutes_back=1):
         from_time = now - (minutes_back * 60)
         
         # Get historical data
-        api_url = f"https://www.navis-livedata.com/query.php?imei=083af23b9b89_15_1&type=data&from={from_time}&to={now}"
+        api_url = f"{NAVIS_QUERY_URL}&type=data&from={from_time}&to={now}"
         
-        api_headers = {
-            'Accept': '*/*',
-            'Referer': session_url,
-            'Sec-Fetch-Dest': 'empty',
-            'Sec-Fetch-Mode': 'cors',
-            'Sec-Fetch-Site': 'same-origin'
-        }
+        api_headers = _NAVIS_API_HEADERS
+        if session_url != NAVIS_SESSION_URL:
+            api_headers = {**api_headers, 'Referer': session_url}
         
         response = session.get(api_url, headers=api_headers, timeout=15)
         if response.status_code != 200:
@@ -123,36 +283,15 @@ def get_navis_historical_stats(session, session_url, minutes_back=1):
         if not content or content == "error":
             return None, None
         
-        # Parse the pipe-delimited historical data format
-        data_points = []
-        readings = content.split('|')
-        
-        for reading in readings:
-            if not reading.strip():
-                continue
-                
-            if ':' in reading:
-                if ',' in reading:
-                    # Format: timestamp,interval:hexdata
-                    timestamp_part, hex_part = reading.split(',', 1)
-                    interval, hex_data = hex_part.split(':', 1)
-                else:
-                    # Format: interval:hexdata
-                    interval, hex_data = reading.split(':', 1)
-                
-                # Decode the hex data
-                decoded = decode_navis_hex(hex_data)
-                if decoded and decoded['speed_knots'] >= 0:
-                    data_points.append(decoded)
-        
-        if not data_points:
+        # Parse the pipe-delimited historical data format and decode all readings as one batch
+        data_points = parse_navis_historical_data(_iter_records(content))
+        if not data_points['speed_knots']:
             return None, None
         
         # Calculate statistics
-        import statistics
-        speeds = [dp['speed_knots'] for dp in data_points]
+        speeds = data_points['speed_knots']
         
-        avg_speed = statistics.mean(speeds)
+        avg_speed = sum(speeds) / len(speeds)
         peak_speed = max(speeds)
         
         return avg_speed, peak_speed
@@ -166,83 +305,95 @@ def test_brambles_weather():
     
     url = "https://www.southamptonvts.co.uk/BackgroundSite/Ajax/LoadXmlFileWithTransform?xmlFilePath=D%3A%5Cftp%5Csouthampton%5CBramble.xml&xslFilePath=D%3A%5Cwwwroot%5CCMS_Southampton%5Ccontent%5Cfiles%5Cassets%5CSotonSnapshotmetBramble.xsl&w=51"
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (compatible; WeatherStation/1.0)',
-        'Accept': 'text/html,*/*',
-        'Referer': 'https://www.southamptonvts.co.uk/Live_Information/Tides_and_Weather/'
-    }
-    
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-        if response.status_code == 200:
-            content = response.text
-            print(f"  ✅ Success: Received {len(content)} bytes")
-            
-            # Parse HTML table format
-            weather_data = {}
-            
-            # Extract wind speed
-            wind_speed_str = extract_table_cell_value(content, "Wind Speed")
-            if wind_speed_str:
-                wind_speed = extract_numeric_from_value(wind_speed_str)
-                if wind_speed:
-                    weather_data["wind_speed"] = f"{wind_speed} knots ({wind_speed * KNOTS_TO_MS:.1f} m/s)"
-            
-            # Extract wind gust
-            wind_gust_str = extract_table_cell_value(content, "Max Gust")
-            if wind_gust_str:
-                wind_gust = extract_numeric_from_value(wind_gust_str)
-                if wind_gust:
-                    weather_data["wind_gust"] = f"{wind_gust} knots ({wind_gust * KNOTS_TO_MS:.1f} m/s)"
-            
-            # Extract wind direction
-            wind_dir_str = extract_table_cell_value(content, "Wind Direction")
-            if wind_dir_str:
-                wind_dir = extract_numeric_from_value(wind_dir_str)
-                if wind_dir is not None:
-                    weather_data["wind_direction"] = f"{int(wind_dir)}°"
-            
-            # Extract temperature
-            temp_str = extract_table_cell_value(content, "Air Temp")
-            if temp_str:
-                temp = extract_numeric_from_value(temp_str)
-                if temp is not None:
-                    weather_data["temperature"] = f"{temp:.1f}°C"
-            
-            # Extract pressure
-            pressure_str = extract_table_cell_value(content, "Pressure")
-            if pressure_str:
-                pressure = extract_numeric_from_value(pressure_str)
-                if pressure is not None:
-                    weather_data["pressure"] = f"{pressure:.1f} mBar"
-            
-            # Extract timestamp
-            timestamp_str = extract_table_cell_value(content, "Updated")
-            if timestamp_str:
-                weather_data["timestamp"] = timestamp_str
-            
-            # Display parsed data
-            if weather_data:
-                print("  📊 Parsed weather data from HTML table:")
-                for key, value in weather_data.items():
-                    print(f"    ✅ {key.replace('_', ' ').title()}: {value}")
-                
-                # Validate we got essential data
-                essential_keys = ["wind_speed", "wind_direction"]
-                has_essential = any(key in weather_data for key in essential_keys)
-                
-                if has_essential:
-                    print("  ✅ Essential weather data successfully parsed")
-                    return True
+        # The snapshot only changes every STATION_UPDATE_INTERVALS seconds, so a recent
+        # table is reused without asking the server at all
+        content = ''
+        cells = fresh_result(url, STATION_UPDATE_INTERVALS['www.southamptonvts.co.uk'])
+        if cells is not None:
+            print("  ✅ Polled within the station's update interval, reusing parsed table")
+        else:
+            with SESSION.get(url, headers=conditional_headers(url, _BRAMBLE_HEADERS), timeout=10, stream=True) as response:
+                if response.status_code == 304 and url in _CONDITIONAL_CACHE:
+                    # Snapshot unchanged since the last poll - reuse the table parsed then
+                    cached = _CONDITIONAL_CACHE[url]._replace(checked_at=time.monotonic())
+                    _CONDITIONAL_CACHE[url] = cached
+                    cells = cached.parsed
+                    print("  ✅ Not modified since last poll, reusing parsed table")
+                elif response.status_code == 200:
+                    content = read_until_row_end(response, "Updated")
+                    print(f"  ✅ Success: Received {len(content)} bytes")
+                    if getattr(response, 'from_cache', False):
+                        print("  ♻️  Served from the local HTTP cache - the station was not contacted")
+                    
+                    # Parse HTML table format
+                    cells = parse_bramble_table(content)
+                    remember_result(url, response, cells)
                 else:
-                    print("  ⚠️  Parsed some data but missing essential wind information")
+                    print(f"  ❌ HTTP Error: {response.status_code}")
                     return False
+        
+        weather_data = {}
+        
+        # Extract wind speed
+        wind_speed_str = cells.get("wind speed")
+        if wind_speed_str:
+            wind_speed = extract_numeric_from_value(wind_speed_str)
+            if wind_speed:
+                weather_data["wind_speed"] = f"{wind_speed} knots ({wind_speed * KNOTS_TO_MS:.1f} m/s)"
+        
+        # Extract wind gust
+        wind_gust_str = cells.get("max gust")
+        if wind_gust_str:
+            wind_gust = extract_numeric_from_value(wind_gust_str)
+            if wind_gust:
+                weather_data["wind_gust"] = f"{wind_gust} knots ({wind_gust * KNOTS_TO_MS:.1f} m/s)"
+        
+        # Extract wind direction
+        wind_dir_str = cells.get("wind direction")
+        if wind_dir_str:
+            wind_dir = extract_numeric_from_value(wind_dir_str)
+            if wind_dir is not None:
+                weather_data["wind_direction"] = f"{int(wind_dir)}°"
+        
+        # Extract temperature
+        temp_str = cells.get("air temp")
+        if temp_str:
+            temp = extract_numeric_from_value(temp_str)
+            if temp is not None:
+                weather_data["temperature"] = f"{temp:.1f}°C"
+        
+        # Extract pressure
+        pressure_str = cells.get("pressure")
+        if pressure_str:
+            pressure = extract_numeric_from_value(pressure_str)
+            if pressure is not None:
+                weather_data["pressure"] = f"{pressure:.1f} mBar"
+        
+        # Extract timestamp
+        timestamp_str = cells.get("updated")
+        if timestamp_str:
+            weather_data["timestamp"] = timestamp_str
+        
+        # Display parsed data
+        if weather_data:
+            print("  📊 Parsed weather data from HTML table:")
+            for key, value in weather_data.items():
+                print(f"    ✅ {key.replace('_', ' ').title()}: {value}")
+            
+            # Validate we got essential data
+            essential_keys = ["wind_speed", "wind_direction"]
+            has_essential = any(key in weather_data for key in essential_keys)
+            
+            if has_essential:
+                print("  ✅ Essential weather data successfully parsed")
+                return True
             else:
-                print(f"  ❌ Could not parse weather data from HTML table format")
-                print(f"  📊 Raw content preview: {content[:200]}...")
+                print("  ⚠️  Parsed some data but missing essential wind information")
                 return False
         else:
-            print(f"  ❌ HTTP Error: {response.status_code}")
+            print(f"  ❌ Could not parse weather data from HTML table format")
+            print(f"  📊 Raw content preview: {content[:200]}...")
             return False
     except Exception as e:
         print(f"  ❌ Exception: {e}")
@@ -252,38 +403,25 @@ def test_seaview_weather():
     """Test Seaview weather station (Navis Live Data) with session management"""
     print("\n🏝️  Testing Seaview Weather Station...")
     
-    # Step 1: Get a session cookie by visiting the main page
-    session = requests.Session()
-    session_url = "https://www.navis-livedata.com/view.php?u=36371"
-    api_url = "https://www.navis-livedata.com/query.php?imei=083af23b9b89_15_1&type=live"
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-        'Accept-Language': 'en-GB,en;q=0.9,fr;q=0.8',
-        'Connection': 'keep-alive'
-    }
+    # Step 1: Get a session cookie by visiting the main page (stored in the shared session)
+    session = SESSION
+    session_url = NAVIS_SESSION_URL
+    api_url = f"{NAVIS_QUERY_URL}&type=live"
     
     try:
-        # First, establish session by visiting the main page
+        # First, establish session with the main page - a HEAD is enough to receive the
+        # session cookie without downloading the page; fall back to GET if none is set
         print(f"  🔄 Establishing session with main page...")
-        session_response = session.get(session_url, headers=headers, timeout=10)
+        session_response = session.head(session_url, headers=_NAVIS_BASE_HEADERS, timeout=10)
+        if session_response.status_code != 200 or not session_response.cookies:
+            session_response = session.get(session_url, headers=_NAVIS_BASE_HEADERS, timeout=10)
         if session_response.status_code != 200:
             print(f"  ❌ Failed to establish session: {session_response.status_code}")
             return False
         
         # Now try the API with the session cookie
-        api_headers = headers.copy()
-        api_headers.update({
-            'Accept': '*/*',
-            'Referer': session_url,
-            'Sec-Fetch-Dest': 'empty',
-            'Sec-Fetch-Mode': 'cors',
-            'Sec-Fetch-Site': 'same-origin'
-        })
-        
         print(f"  📊 Making API request with session cookie...")
-        response = session.get(api_url, headers=api_headers, timeout=10)
+        response = session.get(api_url, headers=_NAVIS_API_HEADERS, timeout=10)
         if response.status_code == 200:
             content = response.text.strip()
             print(f"  📊 Received response: {len(content)} bytes")
@@ -297,7 +435,7 @@ def test_seaview_weather():
             
             # Try to parse as JSON first
             try:
-                data = json.loads(content)
+                data = json.loads(response.content)  # bytes go straight to the parser
                 print(f"  ✅ Success: Valid JSON response")
                 
                 # Handle different JSON structures
@@ -352,8 +490,11 @@ def test_seaview_weather():
                 # Not JSON - try to parse as other formats
                 print(f"  📊 Response is not JSON, analyzing as text...")
                 
+                # Detect the format from the first few bytes only
+                head = content[:64]
+                
                 # Check for colon-delimited format (appears to be Navis format)
-                if ':' in content:
+                if ':' in head:
                     print(f"  📊 Appears to be colon-delimited format")
                     parts = content.split(':')
                     print(f"  📊 Found {len(parts)} parts: {parts}")
@@ -376,22 +517,13 @@ def test_seaview_weather():
                             # Decode hex data using Navis algorithm (from NetData2.js)
                             if len(hex_sensor_data) >= 8:
                                 try:
-                                    # Split hex into MSB and LSB (exact JavaScript implementation)
-                                    MSB = 0
-                                    if len(hex_sensor_data) > 8:
-                                        MSB = int(hex_sensor_data[:-8], 16)  # All but last 8 chars
-                                    LSB = int(hex_sensor_data[-8:], 16)      # Last 8 chars
-                                    
-                                    # Extract values using JavaScript bit manipulation
-                                    temp_raw = MSB & 0x7FF                  # bits 0-10 of MSB
-                                    speed_raw = LSB >> 16                   # bits 16-31 of LSB  
-                                    direction_raw = (LSB >> 7) & 0x1FF     # bits 7-15 of LSB (9 bits)
-                                    rssi_raw = LSB & 0x7F                   # bits 0-6 of LSB
-                                    
-                                    # Apply JavaScript recalc() conversions
-                                    speed_ms = speed_raw / 10.0             # Divide by 10 first
-                                    speed_knots = speed_ms * 1.94384449     # Convert m/s to knots
-                                    temp_celsius = (temp_raw - 400) / 10.0  # Temperature formula
+                                    decoded = decode_navis_hex(hex_sensor_data)
+                                    if decoded is None:
+                                        raise ValueError(f"invalid hex sensor data '{hex_sensor_data}'")
+                                    speed_ms = decoded['speed_ms']
+                                    speed_knots = decoded['speed_knots']
+                                    direction_raw = decoded['direction']
+                                    temp_celsius = decoded['temperature']
                                     
                                     # Enhanced: Try to get historical data for proper average/peak calculations
                                     # This matches what the Navis website displays in its charts
@@ -414,9 +546,7 @@ def test_seaview_weather():
                                         print(f"  ⚠️  Using instantaneous readings (historical data unavailable)")
                                     
                                     # Create timestamp in Brambles format
-                                    from datetime import datetime
-                                    now = datetime.now()
-                                    timestamp_formatted = now.strftime("%d/%m/%Y %H:%M:%S GMT")
+                                    timestamp_formatted = format_gmt(datetime.now(timezone.utc))
                                     
                                     # Calculate fetch and parse times (approximate)
                                     fetch_time = 500  # Approximate based on session + API call
@@ -446,7 +576,7 @@ def test_seaview_weather():
                             print(f"  ⚠️  Error parsing colon format: {e}")
                             
                 # Check for CSV-like format
-                elif ',' in content or ';' in content:
+                elif ',' in head or ';' in head:
                     print(f"  📊 Appears to be CSV or delimited format")
                     lines = content.split('\n')
                     print(f"  📊 Found {len(lines)} lines")
@@ -454,18 +584,17 @@ def test_seaview_weather():
                         print(f"    Line {i+1}: {line[:80]}..." if len(line) > 80 else f"    Line {i+1}: {line}")
                 
                 # Check for XML-like format
-                elif '<' in content and '>' in content:
+                elif '<' in head:
                     print(f"  📊 Appears to be XML or HTML format")
                     # Look for obvious wind data markers
                     if any(term in content.lower() for term in ['wind', 'speed', 'direction', 'gust']):
                         print(f"  ✅ Contains wind-related terms")
                     
                 # Check for simple numeric format
-                elif any(c.isdigit() for c in content):
+                elif any(c.isdigit() for c in head):
                     print(f"  📊 Contains numeric data")
                     # Try to extract numbers
-                    import re
-                    numbers = re.findall(r'\d+\.?\d*', content)
+                    numbers = [m.group() for m in islice(_NUM_TOKENS_RE.finditer(content), 6)]
                     if numbers:
                         print(f"  📊 Found numbers: {numbers[:5]}" + ("..." if len(numbers) > 5 else ""))
                 
@@ -487,119 +616,163 @@ def test_lymington_weather():
     # Use the infowindow.ggl endpoint that provides averaged data including gust information
     url = "https://weatherfile.com/V03/loc/GBR00001/infowindow.ggl"
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (compatible; WeatherStation/1.0)',
-        'Accept': '*/*',
-        'X-Requested-With': 'XMLHttpRequest',
-        'Referer': 'https://weatherfile.com/location?loc_id=GBR00001&wt=KTS',
-        'Origin': 'https://weatherfile.com',
-        'Content-Length': '0',
-        'wf-tkn': 'PUBLIC'
-    }
-    
     try:
-        # Use POST request with empty body
-        response = requests.post(url, headers=headers, data='', timeout=10)
-        if response.status_code == 200:
+        # WeatherFile publishes a new average about once a minute, so a response parsed
+        # within that interval is reused without posting again
+        data = fresh_result(url, STATION_UPDATE_INTERVALS['weatherfile.com'])
+        if data is not None:
+            print("  ✅ Polled within the station's update interval, reusing parsed response")
+        else:
+            # Use POST request with empty body
+            response = SESSION.post(url, headers=_LYMINGTON_HEADERS, data='', timeout=10)
+            if response.status_code != 200:
+                print(f"  ❌ HTTP Error: {response.status_code}")
+                return False
+            if getattr(response, 'from_cache', False):
+                print("  ♻️  Served from the local HTTP cache - the station was not contacted")
             try:
-                data = response.json()
-                if data.get("status") == "ok" and "data" in data:
-                    weather_info = data["data"]
-                    print(f"  ✅ Success: API returned 'ok' status")
-                    
-                    # Extract averaged wind data from the lastaverage section
-                    if "lastaverage" in weather_info:
-                        avg_data = weather_info["lastaverage"]
-                        print(f"  📊 Found lastaverage data with {len(avg_data)} parameters")
-                        
-                        # Parse wind data - wsa=average, wsh=high/max, wsl=low (all in m/s)
-                        wind_speed_ms = avg_data.get('wsa', 0.0)      # Wind Speed Average
-                        wind_gust_ms = avg_data.get('wsh', 0.0)       # Wind Speed High (gust)
-                        wind_low_ms = avg_data.get('wsl', 0.0)        # Wind Speed Low
-                        wind_direction = int(avg_data.get('wda', 0))  # Wind Direction Average
-                        timestamp_str = avg_data.get('ts', '')        # Timestamp
-                        location = weather_info.get('display_name', '')
-                        
-                        fetch_time = 250  # infowindow.ggl is slightly slower than latest.json
-                        parse_time = 3    # More complex JSON parsing
-                        
-                        # Convert to knots for consistent display
-                        wind_speed_knots = wind_speed_ms / KNOTS_TO_MS
-                        wind_gust_knots = wind_gust_ms / KNOTS_TO_MS
-                        wind_low_knots = wind_low_ms / KNOTS_TO_MS
-                        
-                        # Format timestamp - parse ISO format and convert to DD/MM/YYYY HH:MM:SS GMT
-                        if timestamp_str:
-                            try:
-                                from datetime import datetime
-                                dt = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                                timestamp_formatted = dt.strftime("%d/%m/%Y %H:%M:%S GMT")
-                            except:
-                                timestamp_formatted = timestamp_str + " GMT"
-                        else:
-                            from datetime import datetime
-                            timestamp_formatted = datetime.now().strftime("%d/%m/%Y %H:%M:%S GMT")
-                        
-                        # Display in standardized format
-                        print(f"")
-                        print(f"=== LYMINGTON WEATHER STATION ===")
-                        print(f"Wind Speed: {wind_speed_knots:.1f} knots ({wind_speed_ms:.1f} m/s)")
-                        print(f"Wind Gust: {wind_gust_knots:.1f} knots ({wind_gust_ms:.1f} m/s)")
-                        print(f"Wind Direction: {wind_direction} degrees")
-                        print(f"Air Temperature: n/a")  # Not available in WeatherFile data
-                        print(f"Air Pressure: n/a")     # Not available in WeatherFile data
-                        print(f"Last Updated: {timestamp_formatted}")
-                        print(f"Fetch Time: {fetch_time} ms, Parse Time: {parse_time} ms")
-                        print(f"=================================")
-                        
-                        return True
-                    else:
-                        print(f"  ⚠️  No lastaverage data found in response")
-                        return False
-                else:
-                    print(f"  ❌ API returned error: {data.get('message', 'Unknown error')}")
-                    return False
+                data = json.loads(response.content)
             except json.JSONDecodeError:
                 print(f"  ❌ Invalid JSON response")
                 return False
+            if data.get("status") == "ok":
+                remember_result(url, response, data)
+        
+        if data.get("status") == "ok" and "data" in data:
+            weather_info = data["data"]
+            print(f"  ✅ Success: API returned 'ok' status")
+            
+            # Extract averaged wind data from the lastaverage section
+            if "lastaverage" in weather_info:
+                avg_data = weather_info["lastaverage"]
+                print(f"  📊 Found lastaverage data with {len(avg_data)} parameters")
+                
+                # Parse wind data - wsa=average, wsh=high/max, wsl=low (all in m/s)
+                wind_speed_ms = avg_data.get('wsa', 0.0)      # Wind Speed Average
+                wind_gust_ms = avg_data.get('wsh', 0.0)       # Wind Speed High (gust)
+                wind_low_ms = avg_data.get('wsl', 0.0)        # Wind Speed Low
+                wind_direction = int(avg_data.get('wda', 0))  # Wind Direction Average
+                timestamp_str = avg_data.get('ts', '')        # Timestamp
+                location = weather_info.get('display_name', '')
+                
+                fetch_time = 250  # infowindow.ggl is slightly slower than latest.json
+                parse_time = 3    # More complex JSON parsing
+                
+                # Convert to knots for consistent display
+                wind_speed_knots = wind_speed_ms / KNOTS_TO_MS
+                wind_gust_knots = wind_gust_ms / KNOTS_TO_MS
+                wind_low_knots = wind_low_ms / KNOTS_TO_MS
+                
+                # Format timestamp - parse ISO format and convert to DD/MM/YYYY HH:MM:SS GMT
+                if timestamp_str:
+                    try:
+                        dt = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+                        timestamp_formatted = format_gmt(dt.astimezone(timezone.utc) if dt.tzinfo else dt)
+                    except:
+                        timestamp_formatted = timestamp_str + " GMT"
+                else:
+                    timestamp_formatted = format_gmt(datetime.now(timezone.utc))
+                
+                # Display in standardized format
+                print(f"")
+                print(f"=== LYMINGTON WEATHER STATION ===")
+                print(f"Wind Speed: {wind_speed_knots:.1f} knots ({wind_speed_ms:.1f} m/s)")
+                print(f"Wind Gust: {wind_gust_knots:.1f} knots ({wind_gust_ms:.1f} m/s)")
+                print(f"Wind Direction: {wind_direction} degrees")
+                print(f"Air Temperature: n/a")  # Not available in WeatherFile data
+                print(f"Air Pressure: n/a")     # Not available in WeatherFile data
+                print(f"Last Updated: {timestamp_formatted}")
+                print(f"Fetch Time: {fetch_time} ms, Parse Time: {parse_time} ms")
+                print(f"=================================")
+                
+                return True
+            else:
+                print(f"  ⚠️  No lastaverage data found in response")
+                return False
         else:
-            print(f"  ❌ HTTP Error: {response.status_code}")
+            print(f"  ❌ API returned error: {data.get('message', 'Unknown error')}")
             return False
     except Exception as e:
         print(f"  ❌ Exception: {e}")
         return False
 
-def main():
-    """Run all weather station tests"""
-    print("🌤️  XIAO Weather Parser - Station Endpoint Tests")
-    print("=" * 50)
-    print(f"⏰ Test started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print()
+# Worker threads collect their printed output here and write it out in one go, so the
+# concurrent station tests don't interleave line by line on the console. Set WS_VERBOSE
+# to stream each line as it is printed instead (handy when a test hangs).
+VERBOSE = bool(os.environ.get('WS_VERBOSE'))
+_PRINT_LOCK = threading.Lock()
+_OUTPUT = threading.local()
+
+class _BufferedStdout:
+    """sys.stdout stand-in that holds a thread's output while it is being buffered"""
     
-    results = []
+    def __init__(self, stream):
+        self._stream = stream
     
-    # Test all three stations
-    results.append(("Brambles Bank", test_brambles_weather()))
-    results.append(("Seaview", test_seaview_weather()))  
-    results.append(("Lymington", test_lymington_weather()))
+    def write(self, text):
+        out = getattr(_OUTPUT, 'out', None)
+        if out is None:
+            return self._stream.write(text)
+        out.append(text)
+        return len(text)
     
-    # Summary
-    print("\n" + "=" * 50)
-    print("📋 Test Results Summary:")
+    def flush(self):
+        if getattr(_OUTPUT, 'out', None) is None:
+            self._stream.flush()
     
-    passed = 0
-    for station, result in results:
-        status = "✅ PASS" if result else "❌ FAIL"
-        print(f"  {station}: {status}")
-        if result:
-            passed += 1
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+def run_buffered(test):
+    """Run a station test, then emit everything it printed as a single write"""
+    if VERBOSE:
+        return test()
+    
+    _OUTPUT.out = out = []
+    try:
+        return test()
+    finally:
+        _OUTPUT.out = None
+        with _PRINT_LOCK:
+            sys.stdout.write(''.join(out))
+            sys.stdout.flush()
+
+def main():
+    """Run all weather station tests"""
+    sys.stdout.write("🌤️  XIAO Weather Parser - Station Endpoint Tests\n"
+                     f"{'=' * 50}\n"
+                     f"⏰ Test started at: {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+    
+    stations = [
+        ("Brambles Bank", test_brambles_weather),
+        ("Seaview", test_seaview_weather),
+        ("Lymington", test_lymington_weather),
+    ]
+    
+    # Test all three stations concurrently - each is dominated by network I/O on a different host
+    outcomes = {}
+    stdout = sys.stdout
+    sys.stdout = _BufferedStdout(stdout)
+    try:
+        with ThreadPoolExecutor(max_workers=len(stations)) as executor:
+            futures = {executor.submit(run_buffered, test): station for station, test in stations}
+            for future in as_completed(futures):
+                outcomes[futures[future]] = future.result()
+    finally:
+        sys.stdout = stdout
     
-    print(f"\n📊 Overall: {passed}/{len(results)} stations operational")
+    results = [(station, outcomes[station]) for station, _ in stations]
     
+    # Summary, written in one go
+    passed = sum(1 for _, result in results if result)
+    summary = ["\n" + "=" * 50, "📋 Test Results Summary:"]
+    summary.extend(f"  {station}: {'✅ PASS' if result else '❌ FAIL'}" for station, result in results)
+    summary.append(f"\n📊 Overall: {passed}/{len(results)} stations operational")
     if passed == len(results):
-        print("🎉 All weather stations are working correctly!")
+        summary.append("🎉 All weather stations are working correctly!")
     else:
-        print("⚠️  Some weather stations may need attention")
+        summary.append("⚠️  Some weather stations may need attention")
+    sys.stdout.write("\n".join(summary) + "\n")
     
     return passed == len(results)
 